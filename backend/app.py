@@ -1,88 +1,129 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import camelot
+import numpy as np
+import orjson
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+import logging
+import multiprocessing
 import os
+import shutil
 import tempfile
 import re
+import threading
 from werkzeug.utils import secure_filename
 
 app = Flask(__name__)
 CORS(app)
 
+# Per-table parsing details are logged at DEBUG, so they cost nothing unless enabled
+logger = logging.getLogger(__name__)
+
+# Camelot (and Ghostscript) are CPU-heavy, so table extraction runs in worker
+# processes - one per CPU by default - leaving request threads free and
+# letting several PDFs parse in parallel outside the GIL.
+# Workers are spawned rather than forked, since they start from request
+# threads while other threads are running
+def new_camelot_pool():
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+
+CAMELOT_POOL = new_camelot_pool()
+CAMELOT_POOL_LOCK = threading.Lock()
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Statement period date ranges in priority order, compiled once
+STATEMENT_PERIOD_PATTERNS = [re.compile(pattern) for pattern in (
+    r'statement period[:\s]+([a-z]+\s+\d{1,2},?\s+\d{4})\s+to\s+([a-z]+\s+\d{1,2},?\s+\d{4})',
+    r'(\d{1,2}/\d{1,2}/\d{4})\s*-\s*(\d{1,2}/\d{1,2}/\d{4})',
+    r'for the period[:\s]+([a-z]+\s+\d{1,2},?\s+\d{4})\s+to\s+([a-z]+\s+\d{1,2},?\s+\d{4})'
+)]
+STATEMENT_DATE_FORMATS = ('%b %d, %Y', '%B %d, %Y', '%m/%d/%Y')
+
+# Bank indicators in priority order - a match for an earlier bank wins.
+# Keywords are plain substrings, so they may overlap freely between banks
+BANK_KEYWORDS = (
+    ('TD Canada Trust', ('TD CANADA', 'TD BANK', 'TD CHEQUING', 'TD UNLIMITED', 'TD ACCOUNT')),
+    ('RBC Royal Bank', ('RBC', 'ROYAL BANK')),
+    ('Scotiabank', ('SCOTIABANK',)),
+    ('BMO', ('BMO', 'BANK OF MONTREAL')),
+    ('CIBC', ('CIBC',)),
+)
+
+# Fields of each parsed transaction, in response order
+TRANSACTION_COLUMNS = ('date', 'description', 'amount', 'isIncome')
+
+# Minimum Camelot parsing accuracy (0-100) on the first page to use lattice for the whole PDF
+LATTICE_MIN_ACCURACY = 80
+
+# Amount cleanup: currency symbols, commas and whitespace are dropped,
+# and (12.34) accounting notation becomes -12.34
+AMOUNT_STRIP_RE = re.compile(r'[$,\s]')
+AMOUNT_PARENS_RE = re.compile(r'^\((.*)\)$')
+
+# Table rows to skip: header rows by their date cell, balance/total rows by description
+HEADER_DATE_VALUES = frozenset({'date', 'transaction date', ''})
+SUMMARY_ROW_RE = re.compile(r'balance|total', re.IGNORECASE)
+
+# Month abbreviations as used in TD's MMMDD dates (e.g., NOV05)
+MONTH_NUMBERS = {
+    month: number
+    for number, month in enumerate(('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'), start=1)
+}
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def normalize_date(date_str, statement_year=None):
+def normalize_date_column(dates, statement_year=None):
     """
-    Convert various date formats to YYYY-MM-DD
+    Convert a whole column of dates in various formats to YYYY-MM-DD
     TD Bank typically uses MM/DD/YYYY or MMMDD (e.g., NOV05)
+    Cells that match no format come back as NaN
     """
-    if not date_str or pd.isna(date_str):
-        return None
+    dates = dates.astype(str).str.strip().str.upper()
 
-    date_str = str(date_str).strip().upper()
-
-    # Try MM/DD/YYYY format (TD Bank standard)
-    try:
-        dt = datetime.strptime(date_str, '%m/%d/%Y')
-        return dt.strftime('%Y-%m-%d')
-    except:
-        pass
-
-    # Try MM/DD/YY format
-    try:
-        dt = datetime.strptime(date_str, '%m/%d/%y')
-        return dt.strftime('%Y-%m-%d')
-    except:
-        pass
-
-    # Try YYYY-MM-DD (already normalized)
-    try:
-        dt = datetime.strptime(date_str, '%Y-%m-%d')
-        return dt.strftime('%Y-%m-%d')
-    except:
-        pass
+    # Try MM/DD/YYYY (TD Bank standard), then MM/DD/YY, then YYYY-MM-DD (already normalized)
+    parsed = pd.to_datetime(dates, format='%m/%d/%Y', errors='coerce')
+    for date_format in ['%m/%d/%y', '%Y-%m-%d']:
+        missing = parsed.isna()
+        if missing.any():
+            parsed[missing] = pd.to_datetime(dates[missing], format=date_format, errors='coerce')
 
     # Try MMMDD format (e.g., NOV05, DEC31) - TD Bank format without year
-    if statement_year:
-        try:
-            # Parse month abbreviation and day
-            dt = datetime.strptime(f"{date_str}{statement_year}", '%b%d%Y')
-            result = dt.strftime('%Y-%m-%d')
-            print(f"[DATE_DEBUG] Input: '{date_str}' + Year: '{statement_year}' -> Output: '{result}'")
-            return result
-        except Exception as e:
-            print(f"[DATE_ERROR] Failed to parse '{date_str}' with year '{statement_year}': {e}")
-            pass
-
-    return None
-
-def clean_amount(amount_str):
+    missing = parsed.isna()
+    if statement_year and missing.any():
+        # Look the month up directly instead of strptime's locale-aware %b parsing
+        parts = dates[missing].str.extract(r'^([A-Z]{3})(\d{1,2}| [1-9])$')
+        months = parts[0].map(MONTH_NUMBERS).dropna()
+        if not months.empty:
+            parsed.loc[months.index] = pd.to_datetime(pd.DataFrame({
+                'year': int(statement_year),
+                'month': months.astype(int),
+                'day': parts.loc[months.index, 1].str.strip().astype(int)
+            }), errors='coerce')
+
+    return parsed.dt.strftime('%Y-%m-%d')
+
+def clean_amount_column(amounts):
     """
-    Convert amount string to float, handling currency symbols and commas
+    Convert a whole column of amount strings to floats, handling currency symbols and commas
+    Returns a float Series, with 0.0 for empty or unparseable cells
     """
-    if pd.isna(amount_str) or amount_str == '':
-        return 0.0
-
-    # Convert to string and clean
-    amount_str = str(amount_str).strip()
+    amounts = amounts.astype(str)
 
-    # Remove currency symbols, commas, and spaces
-    amount_str = amount_str.replace('$', '').replace(',', '').replace(' ', '')
+    # Statements repeat the same amounts (e.g. $0.00, recurring fees), so
+    # clean each distinct string once and map the results back
+    unique_amounts = pd.Series(amounts.unique())
+    cleaned = (unique_amounts
+               .str.replace(AMOUNT_STRIP_RE, '', regex=True)
+               .str.replace(AMOUNT_PARENS_RE, r'-\1', regex=True))
+    values = pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
 
-    # Handle parentheses (accounting notation for negative)
-    if '(' in amount_str and ')' in amount_str:
-        amount_str = '-' + amount_str.replace('(', '').replace(')', '')
-
-    try:
-        return float(amount_str)
-    except:
-        return 0.0
+    return amounts.map(dict(zip(unique_amounts, values))).astype(float)
 
 def detect_bank_name(text):
     """
@@ -90,24 +131,18 @@ def detect_bank_name(text):
     """
     text_upper = text.upper()
 
-    # TD Bank detection - check for various TD indicators
-    if any(keyword in text_upper for keyword in ['TD CANADA', 'TD BANK', 'TD CHEQUING', 'TD UNLIMITED', 'TD ACCOUNT']):
-        return 'TD Canada Trust'
-    elif 'RBC' in text_upper or 'ROYAL BANK' in text_upper:
-        return 'RBC Royal Bank'
-    elif 'SCOTIABANK' in text_upper:
-        return 'Scotiabank'
-    elif 'BMO' in text_upper or 'BANK OF MONTREAL' in text_upper:
-        return 'BMO'
-    elif 'CIBC' in text_upper:
-        return 'CIBC'
+    # Check banks in priority order so an earlier bank wins
+    for bank_name, keywords in BANK_KEYWORDS:
+        if any(keyword in text_upper for keyword in keywords):
+            return bank_name
 
     return 'Unknown Bank'
 
-def detect_account_number(text):
+def detect_account_number(text, labelled_only=False):
     """
     Extract account number from PDF text
     Returns last 4 digits of the account number
+    With labelled_only, the loose unlabelled pattern is skipped
     """
     # Pattern for TD Bank account numbers (often shows as "Account: XXXX-XXXXXXX" or similar)
     patterns = [
@@ -115,143 +150,244 @@ def detect_account_number(text):
         r'account[:\s#]*(\d{4})(\d{7})',         # Account: 14386236600
         r'(\d{4})[-\s](\d{7})',                  # 1438-6236600
     ]
+    if labelled_only:
+        patterns = patterns[:2]
 
     for pattern in patterns:
         match = re.search(pattern, text, re.IGNORECASE)
         if match:
             # Return last 4 digits (last group)
             last_digits = match.group(2)[-4:] if len(match.groups()) > 1 else match.group(1)[-4:]
-            print(f"[ACCOUNT] Detected account number, last 4 digits: {last_digits}")
             return last_digits
 
-    print("[ACCOUNT] No account number detected")
     return None
 
-def detect_statement_month(text):
+def detect_statement_month(text, patterns=STATEMENT_PERIOD_PATTERNS):
     """
     Extract statement month from PDF text
     Looks for patterns like "Statement Period: Oct 31, 2024 to Nov 28, 2024"
     """
-    # Look for date ranges
-    patterns = [
-        r'statement period[:\s]+([a-z]+\s+\d{1,2},?\s+\d{4})\s+to\s+([a-z]+\s+\d{1,2},?\s+\d{4})',
-        r'(\d{1,2}/\d{1,2}/\d{4})\s*-\s*(\d{1,2}/\d{1,2}/\d{4})',
-        r'for the period[:\s]+([a-z]+\s+\d{1,2},?\s+\d{4})\s+to\s+([a-z]+\s+\d{1,2},?\s+\d{4})'
-    ]
-
     text_lower = text.lower()
 
     for pattern in patterns:
-        match = re.search(pattern, text_lower)
+        match = pattern.search(text_lower)
         if match:
             # Get the end date (second group)
-            end_date_str = match.group(2)
-            try:
-                # Try to parse the end date
-                for date_format in ['%b %d, %Y', '%B %d, %Y', '%m/%d/%Y']:
-                    try:
-                        dt = datetime.strptime(end_date_str.strip(), date_format)
-                        return dt.strftime('%Y-%m')
-                    except:
-                        continue
-            except:
-                pass
-
-    # Default to current month if not found
-    return datetime.now().strftime('%Y-%m')
+            end_date_str = match.group(2).strip()
+            for date_format in STATEMENT_DATE_FORMATS:
+                try:
+                    return datetime.strptime(end_date_str, date_format).strftime('%Y-%m')
+                except ValueError:
+                    continue
+
+    # Not found - the caller decides on a default
+    return None
+
+def classify_amounts(withdrawals, deposits):
+    """
+    Turn withdrawal and deposit float arrays into signed transaction amounts
+    Withdrawals should be negative, deposits should be positive
+    Returns (amounts, is_income, has_amount) arrays; rows with neither amount have has_amount False
+    """
+    is_withdrawal = withdrawals > 0
+    is_income = ~is_withdrawal & (deposits > 0)
+    amounts = np.where(is_withdrawal, -np.abs(withdrawals), np.abs(deposits))
+
+    return amounts, is_income, is_withdrawal | is_income
 
 def parse_td_bank_table(df, bank_name, statement_year=None):
     """
     Parse TD Bank statement table format
     TD Bank format typically: Date | Description | Withdrawals | Deposits | Balance
     Or: Description | Withdrawals | Deposits | Date | Balance
+    Returns a dict of equal-length arrays keyed by TRANSACTION_COLUMNS
     """
-    transactions = []
+    # Clean column names - convert to string first to handle numeric column names.
+    # Columns are then addressed by position, leaving the caller's DataFrame untouched
+    columns = [str(col).strip() for col in df.columns]
 
-    # Clean column names - convert to string first to handle numeric column names
-    df.columns = [str(col).strip() for col in df.columns]
+    # Log columns for debugging
+    logger.debug("[COLUMNS] Detected columns: %s", columns)
 
-    # Print columns for debugging
-    print(f"[COLUMNS] Detected columns: {df.columns}")
+    # Find relevant column positions (case-insensitive)
+    date_idx = None
+    desc_idx = None
+    withdrawal_idx = None
+    deposit_idx = None
 
-    # Find relevant columns (case-insensitive)
-    date_col = None
-    desc_col = None
-    withdrawal_col = None
-    deposit_col = None
-
-    for col in df.columns:
-        col_lower = str(col).lower()
+    for i, col in enumerate(columns):
+        col_lower = col.lower()
         if 'date' in col_lower:
-            date_col = col
+            date_idx = i
         elif 'description' in col_lower or 'transaction' in col_lower:
-            desc_col = col
+            desc_idx = i
         elif 'withdrawal' in col_lower or 'debit' in col_lower:
-            withdrawal_col = col
+            withdrawal_idx = i
         elif 'deposit' in col_lower or 'credit' in col_lower:
-            deposit_col = col
+            deposit_idx = i
 
-    print(f"[MAPPED] Date: {date_col}, Desc: {desc_col}, Withdrawals: {withdrawal_col}, Deposits: {deposit_col}")
+    logger.debug("[MAPPED] Date: %s, Desc: %s, Withdrawals: %s, Deposits: %s", date_idx, desc_idx, withdrawal_idx, deposit_idx)
 
     # If we can't find the standard columns, try positional TD Bank format
     # TD Bank format: [Description, Withdrawal, Deposit, Date, Balance]
-    if not date_col or not desc_col:
-        if len(df.columns) >= 4:
-            desc_col = df.columns[0]      # Column 0: Description
-            withdrawal_col = df.columns[1]  # Column 1: Withdrawals
-            deposit_col = df.columns[2] if len(df.columns) > 2 else None  # Column 2: Deposits
-            date_col = df.columns[3]      # Column 3: Date
-            print(f"[WARNING] Using TD Bank positional format: Desc={desc_col}, Withdrawal={withdrawal_col}, Deposit={deposit_col}, Date={date_col}")
-
-    for idx, row in df.iterrows():
-        # Skip header rows and balance rows
-        date_val = str(row[date_col]).strip() if date_col else ''
-        desc_val = str(row[desc_col]).strip() if desc_col else ''
-
-        # Skip empty dates, header rows, or balance rows
-        if not date_val or date_val.lower() in ['date', 'transaction date', '']:
-            continue
-        if 'balance' in desc_val.lower() or 'total' in desc_val.lower():
-            continue
-
-        # Parse date
-        date = normalize_date(date_val, statement_year)
-        if not date:
-            continue
-
-        # Get description
-        description = str(row[desc_col]).strip() if desc_col and not pd.isna(row[desc_col]) else 'Unknown Transaction'
-
-        # Get amounts from withdrawal and deposit columns
-        withdrawal_amount = 0.0
-        deposit_amount = 0.0
-
-        if withdrawal_col and not pd.isna(row[withdrawal_col]):
-            withdrawal_amount = clean_amount(row[withdrawal_col])
-
-        if deposit_col and not pd.isna(row[deposit_col]):
-            deposit_amount = clean_amount(row[deposit_col])
-
-        # Determine final amount and type
-        # Withdrawals should be negative, deposits should be positive
-        if withdrawal_amount > 0:
-            amount = -abs(withdrawal_amount)
-            is_income = False
-        elif deposit_amount > 0:
-            amount = abs(deposit_amount)
-            is_income = True
+    if date_idx is None or desc_idx is None:
+        if len(columns) >= 4:
+            desc_idx = 0        # Column 0: Description
+            withdrawal_idx = 1  # Column 1: Withdrawals
+            deposit_idx = 2     # Column 2: Deposits
+            date_idx = 3        # Column 3: Date
+            logger.debug("[POSITIONAL] Using TD Bank positional format: Desc=%s, Withdrawal=%s, Deposit=%s, Date=%s", desc_idx, withdrawal_idx, deposit_idx, date_idx)
+
+    # Without a date column every row would be skipped
+    if date_idx is None:
+        return {
+            'date': np.array([], dtype=object),
+            'description': np.array([], dtype=object),
+            'amount': np.array([], dtype=float),
+            'isIncome': np.array([], dtype=bool)
+        }
+
+    dates = df.iloc[:, date_idx].astype(str).str.strip()
+    descs = df.iloc[:, desc_idx].astype(str).str.strip() if desc_idx is not None else pd.Series('', index=df.index)
+
+    # Skip empty dates, header rows, or balance rows
+    keep = ~dates.str.lower().isin(HEADER_DATE_VALUES) & ~descs.str.contains(SUMMARY_ROW_RE, na=False)
+
+    # Parse date
+    parsed_dates = normalize_date_column(dates[keep], statement_year).reindex(df.index)
+    keep &= parsed_dates.notna()
+
+    # Get description
+    if desc_idx is not None:
+        descriptions = descs.where(df.iloc[:, desc_idx].notna(), 'Unknown Transaction')
+    else:
+        descriptions = pd.Series('Unknown Transaction', index=df.index)
+
+    # Get amounts from withdrawal and deposit columns
+    no_amount = pd.Series(0.0, index=df.index)
+    withdrawal_amounts = clean_amount_column(df.iloc[:, withdrawal_idx]) if withdrawal_idx is not None else no_amount
+    deposit_amounts = clean_amount_column(df.iloc[:, deposit_idx]) if deposit_idx is not None else no_amount
+
+    # Determine final amount and type, skipping transactions with no amount
+    amounts, is_income, has_amount = classify_amounts(withdrawal_amounts.to_numpy(), deposit_amounts.to_numpy())
+    keep &= has_amount
+
+    # Return parallel column arrays; records are only built for the response
+    keep = keep.to_numpy()
+    return {
+        'date': parsed_dates.to_numpy()[keep],
+        'description': descriptions.to_numpy()[keep],
+        'amount': amounts[keep],
+        'isIncome': is_income[keep]
+    }
+
+def count_pdf_pages(pdf_path):
+    """
+    Number of pages in the PDF
+    """
+    import PyPDF2
+    with open(pdf_path, 'rb') as pdf_file:
+        return len(PyPDF2.PdfReader(pdf_file).pages)
+
+def choose_camelot_flavor(pdf_path):
+    """
+    Pick the Camelot flavor for the whole PDF by probing the first page
+    Lattice works better for tables with lines, stream for tables without
+    Returns (flavor, probe_tables) - the probe's page 1 tables are reused when lattice wins
+    """
+    try:
+        probe = camelot.read_pdf(pdf_path, pages='1', flavor='lattice')
+    except Exception as e:
+        print(f"[WARNING] Lattice probe failed: {e}")
+        return 'stream', []
+
+    accuracy = max((table.parsing_report['accuracy'] for table in probe), default=0)
+    print(f"[PROBE] Lattice found {len(probe)} tables on page 1, accuracy: {accuracy}")
+
+    if accuracy >= LATTICE_MIN_ACCURACY:
+        return 'lattice', list(probe)
+    return 'stream', []
+
+def extract_tables(pdf_path):
+    """
+    Extract tables from all pages using Camelot
+    Runs in CAMELOT_POOL, so only the picklable DataFrames are returned
+    """
+    flavor, tables = choose_camelot_flavor(pdf_path)
+
+    try:
+        if flavor == 'lattice':
+            # Page 1 was already extracted by the probe
+            if count_pdf_pages(pdf_path) > 1:
+                tables += list(camelot.read_pdf(pdf_path, pages='2-end', flavor=flavor))
         else:
-            # Skip transactions with no amount
-            continue
+            tables = list(camelot.read_pdf(pdf_path, pages='all', flavor=flavor))
+    except Exception as e:
+        if flavor != 'lattice':
+            raise
+        print(f"[WARNING] Lattice method failed: {e}")
+        # Fall back to stream method (works better for tables without lines)
+        flavor = 'stream'
+        tables = list(camelot.read_pdf(pdf_path, pages='all', flavor=flavor))
 
-        transactions.append({
-            'date': date,
-            'description': description,
-            'amount': amount,
-            'isIncome': is_income
-        })
+    print(f"[SUCCESS] {flavor.capitalize()} method found {len(tables)} tables")
 
-    return transactions
+    return [table.df for table in tables]
+
+def submit_extract_tables(pdf_path):
+    """
+    Queue extract_tables on CAMELOT_POOL, replacing the pool if it is broken
+    """
+    global CAMELOT_POOL
+    pool = CAMELOT_POOL
+    try:
+        return pool.submit(extract_tables, pdf_path)
+    except BrokenProcessPool:
+        with CAMELOT_POOL_LOCK:
+            # Another request may have replaced it already
+            if CAMELOT_POOL is pool:
+                print("[WARNING] Camelot worker pool broken, starting a new one")
+                pool.shutdown(wait=False)
+                CAMELOT_POOL = new_camelot_pool()
+            pool = CAMELOT_POOL
+        return pool.submit(extract_tables, pdf_path)
+
+def detect_pdf_metadata(pdf_path):
+    """
+    Detect bank name, statement month, and account number from the PDF text
+    The first and last pages are read first; the middle pages only when those aren't enough
+    Returns (bank_name, statement_month, account_number), statement_month is None if not found
+    """
+    import PyPDF2
+    with open(pdf_path, 'rb') as pdf_file:
+        pages = PyPDF2.PdfReader(pdf_file).pages
+        page_texts = [None] * len(pages)
+
+        def read_pages(indices):
+            # Each page is extracted at most once, even across the fallback
+            for i in indices:
+                if page_texts[i] is None:
+                    page_texts[i] = pages[i].extract_text() or ''
+            # Join once instead of re-copying the accumulated text for every page
+            return ''.join(page_texts[i] for i in indices)
+
+        # The bank name, statement period and account number appear on the first and last pages
+        text = read_pages(sorted({0, len(pages) - 1}) if pages else [])
+        # Only top-priority results count here: a lower-priority bank or period
+        # pattern, or the loose unlabelled account pattern, could be beaten by
+        # a match on a middle page of the full text
+        bank_name = detect_bank_name(text)
+        statement_month = detect_statement_month(text, STATEMENT_PERIOD_PATTERNS[:1])
+        account_number = detect_account_number(text, labelled_only=True)
+
+        # Fall back to the whole PDF if the first and last pages weren't enough
+        if bank_name != BANK_KEYWORDS[0][0] or not statement_month or not account_number:
+            text = read_pages(range(len(pages)))
+            bank_name = detect_bank_name(text)
+            statement_month = detect_statement_month(text)
+            account_number = detect_account_number(text)
+
+    return bank_name, statement_month, account_number
 
 @app.route('/api/parse-pdf', methods=['POST'])
 def parse_pdf():
@@ -275,38 +411,32 @@ def parse_pdf():
 
         # Save to temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            file.save(tmp_file.name)
+            # Stream the upload straight into the open temp file in 1 MiB chunks
+            shutil.copyfileobj(file.stream, tmp_file, length=1 << 20)
             tmp_path = tmp_file.name
 
         try:
             # Extract tables using Camelot
             print(f"[PARSING] PDF: {file.filename}")
 
-            # Try lattice method first (works better for tables with lines)
+            # Camelot runs in a worker process while this thread reads the
+            # PDF text and detects the bank name, statement month, and
+            # account number - including any full-text fallback - so
+            # extraction takes roughly the slower of the two
+            tables_future = submit_extract_tables(tmp_path)
+            bank_name, statement_month, account_number = detect_pdf_metadata(tmp_path)
             try:
-                tables = camelot.read_pdf(tmp_path, pages='all', flavor='lattice')
-                print(f"[SUCCESS] Lattice method found {len(tables)} tables")
-            except Exception as e:
-                print(f"[WARNING] Lattice method failed: {e}")
-                # Fall back to stream method (works better for tables without lines)
-                tables = camelot.read_pdf(tmp_path, pages='all', flavor='stream')
-                print(f"[SUCCESS] Stream method found {len(tables)} tables")
+                tables = tables_future.result()
+            except BrokenProcessPool:
+                # A worker died (e.g. Ghostscript crash or OOM kill) - retry once on a fresh pool
+                tables = submit_extract_tables(tmp_path).result()
 
             if len(tables) == 0:
                 return jsonify({'error': 'No tables found in PDF. Please ensure the PDF contains text (not scanned images).'}), 400
 
-            # Read the entire PDF text for metadata extraction
-            import PyPDF2
-            with open(tmp_path, 'rb') as pdf_file:
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                full_text = ''
-                for page in pdf_reader.pages:
-                    full_text += page.extract_text()
-
-            # Detect bank name, statement month, and account number
-            bank_name = detect_bank_name(full_text)
-            statement_month = detect_statement_month(full_text)
-            account_number = detect_account_number(full_text)
+            # Default to current month if not found
+            if not statement_month:
+                statement_month = datetime.now().strftime('%Y-%m')
 
             # Extract year from statement_month (format: YYYY-MM)
             statement_year = statement_month.split('-')[0] if statement_month else None
@@ -314,30 +444,33 @@ def parse_pdf():
             print(f"[DETECTED] {bank_name}, Statement Month: {statement_month}, Year: {statement_year}, Account: {account_number}")
 
             # Parse all tables and combine transactions
-            all_transactions = []
-
-            for i, table in enumerate(tables):
+            def parse_table(numbered_table):
+                i, df = numbered_table
                 print(f"\n[TABLE {i+1}/{len(tables)}] Processing...")
-                df = table.df
 
-                # Debug: Print raw DataFrame info
-                print(f"[DEBUG] DataFrame shape: {df.shape}")
-                print(f"[DEBUG] DataFrame columns: {df.columns.tolist()}")
-                print(f"[DEBUG] First 3 rows:\n{df.head(3)}")
+                # Debug: Log raw DataFrame info
+                logger.debug("[DEBUG] DataFrame shape: %s", df.shape)
+                logger.debug("[DEBUG] DataFrame columns: %s", df.columns.tolist())
+                logger.debug("[DEBUG] First 3 rows:\n%s", df.head(3))
 
                 # Parse transactions from this table
                 transactions = parse_td_bank_table(df, bank_name, statement_year)
-                all_transactions.extend(transactions)
-                print(f"   Found {len(transactions)} transactions in table {i+1}")
+                print(f"   Found {len(transactions['date'])} transactions in table {i+1}")
+                return transactions
+
+            # Tables are independent, so parse them in parallel; map keeps table order
+            with ThreadPoolExecutor(max_workers=min(8, len(tables))) as executor:
+                table_transactions = list(executor.map(parse_table, enumerate(tables)))
+
+            # Concatenate each column across tables once
+            transactions_df = pd.DataFrame({
+                column: np.concatenate([transactions[column] for transactions in table_transactions])
+                for column in TRANSACTION_COLUMNS
+            })
 
             # Remove duplicates based on date + description + amount
-            seen = set()
-            unique_transactions = []
-            for txn in all_transactions:
-                key = (txn['date'], txn['description'], txn['amount'])
-                if key not in seen:
-                    seen.add(key)
-                    unique_transactions.append(txn)
+            transactions_df = transactions_df.drop_duplicates(subset=['date', 'description', 'amount'])
+            unique_transactions = transactions_df.to_dict('records')
 
             print(f"\n[COMPLETE] Total unique transactions: {len(unique_transactions)}")
 
@@ -353,7 +486,8 @@ def parse_pdf():
                 }
             }
 
-            return jsonify(response), 200
+            # orjson encodes the transaction list much faster than the stdlib json behind jsonify
+            return app.response_class(orjson.dumps(response, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json'), 200
 
         finally:
             # Clean up temporary file